@@ -2,11 +2,20 @@
 
 import os
 import argparse
+import asyncio
+import hashlib
+import json
 import logging
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, TextIO, Union
 
+import httpx
 from dotenv import load_dotenv
-from notion_client import Client
-from notion_client.errors import APIResponseError
+from notion_client import AsyncClient
+from notion_client.errors import APIErrorCode, APIResponseError, HTTPResponseError, RequestTimeoutError, build_request_error
 from striprtf.striprtf import rtf_to_text
 from docx import Document 
 
@@ -29,212 +38,1023 @@ if not NOTION_TOKEN:
     logging.error("NOTION_TOKEN not found in environment. Please set it in .env or as an environment variable.")
     exit(1)
 
-notion = Client(auth=NOTION_TOKEN)
+# One pooled HTTP/2 client is shared by the whole walk, so concurrent
+# requests are multiplexed over a few long-lived TLS connections.
+REQUEST_TIMEOUT_SECONDS = 30
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    timeout=REQUEST_TIMEOUT_SECONDS
+)
+notion = AsyncClient(
+    auth=NOTION_TOKEN,
+    client=http_client,
+    timeout_ms=REQUEST_TIMEOUT_SECONDS * 1000,
+    # Retries are handled by call_notion so that they go through rate_limiter too
+    retry=False
+)
+
+# Resolved once rather than walking notion.pages.create for every page.
+# (Block appends bypass notion-client; see append_children_json.)
+create_page = notion.pages.create
+update_page = notion.pages.update
+
+# Caps how many Notion requests are in flight at once. Items are processed
+# concurrently; the request rate itself is paced by rate_limiter.
+MAX_CONCURRENT_REQUESTS = 8
+api_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# File reads run on this pool so disk I/O overlaps with in-flight Notion requests.
+read_pool = ThreadPoolExecutor(max_workers=8)
+
+# Caps how many text files are held open while being streamed into Notion,
+# so a folder with thousands of files doesn't run out of file descriptors.
+MAX_OPEN_FILES = 32
+open_file_slots = asyncio.Semaphore(MAX_OPEN_FILES)
+
+# Number of coroutines pulling folders off the shared work queue.
+FOLDER_WORKERS = 8
+
+# Extensions of plain-text files that are streamed into pages as-is.
+TEXT_EXTS = frozenset({".txt", ".md", ".markdown", ".log"})
+
+# Text files larger than this (in bytes) are attached as a file block rather
+# than converted to text; they'd need thousands of blocks and tend to time out.
+MAX_TEXT_SIZE = 5 * 1024 * 1024
+
+# -------------------------------------------------
+# Rate Limiting
+# -------------------------------------------------
+
+class TokenBucket:
+    """
+    Client-side rate limiter. Tokens refill at `rate` per second, up to
+    `burst` saved-up tokens; `async with bucket:` waits for a token, so
+    requests are paced just under Notion's limit instead of bouncing off it.
+    """
+
+    def __init__(self, rate: float = 2.8, burst: int = 3):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+rate_limiter = TokenBucket()
+
+# -------------------------------------------------
+# Circuit Breaker
+# -------------------------------------------------
+
+class NotionUnavailable(Exception):
+    """
+    Raised when a call failed because Notion seems to be down or unreachable
+    (a server error or timeout) rather than because of the request itself.
+    The item is worth retrying later.
+    """
+
+class BreakerOpen(NotionUnavailable):
+    """
+    Raised instead of calling Notion while the circuit breaker is open.
+    """
+
+class CircuitBreaker:
+    """
+    Stops hammering Notion during a sustained outage. After failure_threshold
+    consecutive failures the breaker opens and calls fail fast with
+    BreakerOpen. Once reset_timeout seconds have passed it is half-open:
+    a single trial call goes through, which closes the breaker again if it
+    succeeds or re-opens it if it fails.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        # Times the breaker has opened since the last successful call
+        self.trips = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self):
+        """
+        Raises BreakerOpen if a call shouldn't be made right now.
+        """
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise BreakerOpen("Notion circuit breaker is open")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                raise BreakerOpen("Notion circuit breaker is half-open; trial call in flight")
+            self._trial_in_flight = True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "open":
+            return
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            self._trial_in_flight = False
+            logging.warning("Notion appears to be unavailable; pausing requests for %ss", self.reset_timeout)
+
+    def retry_after(self) -> float:
+        """
+        Seconds to wait before calls are worth attempting again (0 if now).
+        """
+        if self.state == "open":
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        if self.state == "half_open" and self._trial_in_flight:
+            return 1.0
+        return 0.0
+
+notion_breaker = CircuitBreaker()
+
+# Consecutive breaker trips after which items hitting the open breaker are
+# given up on instead of being queued again.
+MAX_BREAKER_TRIPS = 5
+
+# Times an item whose own request failed with a server error or timeout is
+# queued again, so a request that always fails can't be retried forever.
+MAX_ITEM_RETRIES = 5
+
+def _is_outage_error(e: Exception) -> bool:
+    """
+    True for errors that suggest Notion itself is down or unreachable, as
+    opposed to a problem with a particular request.
+    """
+    if isinstance(e, HTTPResponseError):
+        return e.status >= 500
+    return isinstance(e, (RequestTimeoutError, httpx.TransportError))
+
+# How often a rate-limited (429) request is retried before giving up.
+MAX_RATE_LIMIT_RETRIES = 5
+
+async def call_notion(method, **kwargs):
+    """
+    Calls a notion-client endpoint method (e.g. notion.pages.create) with
+    the given arguments. Every call is paced by rate_limiter and bounded by
+    api_semaphore; if Notion still answers 429, the call is retried after
+    its Retry-After delay (or an exponential back-off) plus some jitter.
+
+    Outcomes are reported to notion_breaker; while it is open the call
+    raises BreakerOpen without contacting Notion. Server errors and
+    timeouts are raised as NotionUnavailable so the item can be retried.
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        if notion_breaker.retry_after():
+            # Fail fast, without waiting for a slot or a rate-limit token
+            raise BreakerOpen("Notion circuit breaker is open")
+        try:
+            async with api_semaphore, rate_limiter:
+                notion_breaker.before_call()
+                result = await method(**kwargs)
+        except NotionUnavailable:
+            raise
+        except Exception as e:
+            if _is_outage_error(e):
+                notion_breaker.record_failure()
+                raise NotionUnavailable(f"Notion unavailable: {e}") from e
+            else:
+                # Notion answered, so it's up even if it rejected the request
+                notion_breaker.record_success()
+            is_rate_limited = isinstance(e, APIResponseError) and e.code == APIErrorCode.RateLimited
+            if not is_rate_limited or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            try:
+                delay = float(e.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                delay = 2 ** attempt
+            delay += random.uniform(0, 0.5)
+            logging.warning("Rate limited by Notion; retrying in %.1fs (attempt %s/%s)", delay, attempt + 1, MAX_RATE_LIMIT_RETRIES)
+            await asyncio.sleep(delay)
+            continue
+        notion_breaker.record_success()
+        return result
+
+# -------------------------------------------------
+# Sync Cache
+# -------------------------------------------------
+
+class SyncCache:
+    """
+    Remembers what earlier runs already created in Notion so a re-run
+    (or a resumed, partially-finished run) can skip it. Entries are kept
+    per type and never expire (content keys change when a file does):
+    - "page":  folder or file key -> ID of the page created for it.
+    - "block": file content key -> ID of a file page whose content was fully appended.
+    - "link":  file content key -> [file key, page ID] of the page a
+               duplicate file's page links to.
+    The cache lives in memory and is persisted as JSON by save().
+    """
+    kinds = ("page", "block", "link")
+
+    def __init__(self):
+        self.path = None
+        self._entries = {kind: {} for kind in self.kinds}
+
+    def load(self, path: str):
+        """
+        Loads cached entries from path (if it exists); save() writes back there.
+        """
+        self.path = path
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except Exception as e:
+            logging.warning("Ignoring unreadable sync cache '%s': %s", path, e)
+            return
+        for kind in self.kinds:
+            self._entries[kind].update(stored.get(kind, {}))
+        logging.info("Loaded sync cache '%s'", path)
+
+    def save(self):
+        """
+        Writes the cache to the path given to load().
+        """
+        if not self.path:
+            return
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+        except Exception as e:
+            logging.error("Error saving sync cache '%s': %s", self.path, e)
+
+    def get(self, kind: str, key: str):
+        return self._entries[kind].get(key)
+
+    def set(self, kind: str, key: str, value):
+        self._entries[kind][key] = value
+
+    def discard(self, kind: str, key: str):
+        self._entries[kind].pop(key, None)
+
+sync_cache = SyncCache()
+
+def cache_key(parent_page_id: str, entry: os.DirEntry) -> str:
+    """
+    Builds a stable cache key for the page mirroring a directory entry.
+    """
+    return hashlib.sha1("\0".join([parent_page_id, entry.name]).encode("utf-8")).hexdigest()
+
+def content_key(parent_page_id: str, entry: os.DirEntry) -> str:
+    """
+    Builds a cache key for a file's current content: like cache_key, but
+    also including its mtime and size so that a changed file is synced again.
+    """
+    stat = entry.stat()
+    parts = [parent_page_id, entry.name, str(stat.st_mtime_ns), str(stat.st_size)]
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
 
 # -------------------------------------------------
 # Notion Helpers
 # -------------------------------------------------
 
-def create_notion_page(parent_page_id: str, title: str) -> str:
+async def create_notion_page(parent_page_id: str, title: str, key: Optional[str] = None) -> str:
     """
     Creates a new page inside the given Notion parent page,
     with the given title. Returns the newly created page ID.
+
+    If a cache key is given and sync_cache already has a page for it,
+    that page's ID is returned without calling Notion.
     """
-    logging.debug(f"Attempting to create Notion page under parent '{parent_page_id}' with title: '{title}'")
+    if key:
+        cached_page_id = sync_cache.get("page", key)
+        if cached_page_id:
+            logging.info("Reusing page '%s' -> Page ID: %s", title, cached_page_id)
+            return cached_page_id
+
+    logging.debug("Attempting to create Notion page under parent '%s' with title: '%s'", parent_page_id, title)
     try:
-        new_page = notion.pages.create(
+        new_page = await call_notion(
+            create_page,
             parent={"page_id": parent_page_id},
             properties={
                 "title": [{"type": "text", "text": {"content": title}}]
             }
         )
         page_id = new_page["id"]
-        logging.info(f"Created page '{title}' -> Page ID: {page_id}")
+        logging.info("Created page '%s' -> Page ID: %s", title, page_id)
+        if key:
+            sync_cache.set("page", key, page_id)
         return page_id
+    except NotionUnavailable:
+        raise
     except APIResponseError as e:
-        logging.error(f"Notion API error creating page '{title}': {e}")
+        logging.error("Notion API error creating page '%s': %s", title, e)
         raise
     except Exception as e:
-        logging.error(f"Unexpected error creating page '{title}': {e}")
+        logging.error("Unexpected error creating page '%s': %s", title, e)
         raise
 
-def append_text_block(page_id: str, text_content: str):
+async def trash_notion_page(page_id: str):
     """
-    Appends the text_content to the given page_id, chunked into multiple
-    paragraph blocks if it exceeds 2000 characters. Also batches them so
-    we don't exceed Notion's limit of 100 blocks per request.
+    Moves a page this script created earlier to Notion's trash.
     """
-    logging.debug(f"Appending text block to page {page_id} (content length: {len(text_content)} chars)")
-    
-    chunk_size = 2000
-    max_blocks_per_request = 50  # A bit lower than 100 to be safe
+    logging.debug("Attempting to move page %s to trash", page_id)
+    try:
+        await call_notion(update_page, page_id=page_id, in_trash=True)
+        logging.info("Moved page %s to trash", page_id)
+    except NotionUnavailable:
+        raise
+    except APIResponseError as e:
+        logging.error("Notion API error moving page %s to trash: %s", page_id, e)
+        raise
+    except Exception as e:
+        logging.error("Unexpected error moving page %s to trash: %s", page_id, e)
+        raise
 
-    # Break text_content into chunks of <= 2000 characters.
-    chunks = [text_content[i:i+chunk_size] for i in range(0, len(text_content), chunk_size)]
-    
-    # Build paragraph blocks from the chunks
-    all_blocks = []
-    for chunk in chunks:
-        block = {
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {"content": chunk}
-                    }
-                ]
-            }
-        }
-        all_blocks.append(block)
-    
-    # Now we need to append these blocks in batches (max 50 blocks per request).
+# Paragraph block JSON with a %s slot for the JSON-encoded text. Blocks are
+# built by splicing into this instead of allocating nested dicts per chunk.
+PARAGRAPH_BLOCK_TEMPLATE = (
+    '{"object":"block","type":"paragraph","paragraph":'
+    '{"rich_text":[{"type":"text","text":{"content":%s}}]}}'
+)
+
+async def append_children_json(block_id: str, children_json: str):
+    """
+    Appends already-serialized blocks (a JSON array) to the given block,
+    sending them as-is instead of having notion-client re-encode dicts.
+    Errors are raised the same way notion-client raises them.
+    """
+    payload = ('{"children":' + children_json + '}').encode("utf-8")
     try:
-        for i in range(0, len(all_blocks), max_blocks_per_request):
-            batch = all_blocks[i:i+max_blocks_per_request]
-            notion.blocks.children.append(
+        response = await http_client.patch(
+            f"blocks/{block_id}/children",
+            content=payload,
+            headers={"Content-Type": "application/json"}
+        )
+    except httpx.TimeoutException:
+        raise RequestTimeoutError()
+    if response.is_error:
+        raise build_request_error(response, response.text)
+    return response.json()
+
+class BlockAppendBuffer:
+    """
+    Collects blocks (as serialized JSON) per page so they can be sent with
+    as few append requests as possible. Notion accepts up to 100 children
+    per request; a page's buffer is flushed as soon as it reaches that
+    size, and whatever is left is sent by flush_all().
+
+    It also counts the blocks successfully sent to each page, so a file
+    retried after NotionUnavailable can carry on where it stopped.
+    """
+    max_blocks_per_request = 100
+
+    def __init__(self):
+        self._pending = {}
+        self._sent = {}
+
+    def sent_count(self, page_id: str) -> int:
+        """
+        Number of blocks already appended to page_id through this buffer.
+        """
+        return self._sent.get(page_id, 0)
+
+    async def add(self, page_id: str, block: str):
+        """
+        Queues a block for the given page, flushing the page if its
+        buffer is full.
+        """
+        blocks = self._pending.setdefault(page_id, [])
+        blocks.append(block)
+        if len(blocks) >= self.max_blocks_per_request:
+            await self.flush(page_id)
+
+    def discard(self, page_id: str):
+        """
+        Drops the blocks buffered for page_id without sending them.
+        """
+        self._pending.pop(page_id, None)
+
+    async def flush(self, page_id: str):
+        """
+        Sends all blocks buffered for page_id in a single request.
+        """
+        blocks = self._pending.pop(page_id, None)
+        if not blocks:
+            return
+        logging.debug("Flushing %s block(s) to page %s", len(blocks), page_id)
+        try:
+            await call_notion(
+                append_children_json,
                 block_id=page_id,
-                children=batch
+                children_json="[" + ",".join(blocks) + "]"
             )
-        logging.info(f"Appended text block(s) to page {page_id} ({len(chunks)} chunk(s))")
+            self._sent[page_id] = self.sent_count(page_id) + len(blocks)
+        except NotionUnavailable:
+            raise
+        except APIResponseError as e:
+            logging.error("Notion API error appending %s block(s) to page %s: %s", len(blocks), page_id, e)
+            raise
+        except Exception as e:
+            logging.error("Unexpected error appending %s block(s) to page %s: %s", len(blocks), page_id, e)
+            raise
+
+    async def flush_all(self):
+        """
+        Flushes every page that still has buffered blocks. A failure on one
+        page is logged and does not stop the others from being flushed.
+        """
+        page_ids = list(self._pending)
+        results = await asyncio.gather(
+            *(self.flush(page_id) for page_id in page_ids),
+            return_exceptions=True
+        )
+        for page_id, result in zip(page_ids, results):
+            if isinstance(result, Exception):
+                logging.warning("Failed to append buffered blocks to page %s.", page_id)
+
+append_buffer = BlockAppendBuffer()
+
+async def _iter_text_chunks(text_content: Union[str, TextIO], chunk_size: int):
+    """
+    Yields text_content in chunks of at most chunk_size characters.
+    Open files are read one chunk at a time on read_pool, so only a
+    single chunk of the file is held in memory here.
+    """
+    if isinstance(text_content, str):
+        # Slice text_content into chunks of <= 2000 characters as we go,
+        # without building a list of all of them first.
+        for i in range(0, len(text_content), chunk_size):
+            yield text_content[i:i+chunk_size]
+        return
+
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(read_pool, text_content.read, chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+async def append_text_block(page_id: str, text_content: Union[str, TextIO]):
+    """
+    Appends the text_content (a string or an open text file) to the given
+    page_id, chunked into multiple paragraph blocks if it exceeds 2000
+    characters. The blocks are queued on append_buffer, which batches them
+    into requests of up to 100 blocks; files are streamed rather than read
+    into memory up front.
+
+    If part of the text already reached this page (an earlier attempt was
+    cut off by NotionUnavailable), those chunks are skipped.
+    """
+    logging.debug("Appending text block to page %s", page_id)
+    
+    chunk_size = 2000
+    already_sent = append_buffer.sent_count(page_id)
+
+    # Build paragraph blocks from the chunks and queue them
+    try:
+        chunk_count = 0
+        async for chunk in _iter_text_chunks(text_content, chunk_size):
+            chunk_count += 1
+            if chunk_count <= already_sent:
+                continue
+            block = PARAGRAPH_BLOCK_TEMPLATE % json.dumps(chunk, ensure_ascii=False)
+            await append_buffer.add(page_id, block)
+        logging.info("Queued text block(s) for page %s (%s chunk(s))", page_id, chunk_count)
+    except (NotionUnavailable, OSError, UnicodeDecodeError):
+        # Handled by the caller
+        raise
     except APIResponseError as e:
-        logging.error(f"Notion API error appending text block to page {page_id}: {e}")
+        logging.error("Notion API error appending text block to page %s: %s", page_id, e)
         raise
     except Exception as e:
-        logging.error(f"Unexpected error appending text block to page {page_id}: {e}")
+        logging.error("Unexpected error appending text block to page %s: %s", page_id, e)
         raise
 
-def append_file_block(page_id: str, file_path: str):
+async def append_file_block(page_id: str, file_path: str):
     """
-    Appends a file block to the Notion page.
+    Appends a file block to the Notion page (queued on append_buffer).
 
     NOTE: This example uses a dummy URL. For real uploads to Notion,
     you'd need the file upload workflow (files:write permission).
     """
+    if append_buffer.sent_count(page_id):
+        # Already appended by an earlier attempt
+        return
     dummy_url = f"https://example.com/files/{os.path.basename(file_path)}"
-    logging.debug(f"Appending file block for '{file_path}' with dummy URL '{dummy_url}' to page {page_id}")
+    logging.debug("Appending file block for '%s' with dummy URL '%s' to page %s", file_path, dummy_url, page_id)
     try:
-        notion.blocks.children.append(
-            block_id=page_id,
-            children=[
-                {
-                    "object": "block",
-                    "type": "file",
-                    "file": {
-                        "type": "external",
-                        "external": {
-                            "url": dummy_url
-                        }
+        await append_buffer.add(
+            page_id,
+            json.dumps({
+                "object": "block",
+                "type": "file",
+                "file": {
+                    "type": "external",
+                    "external": {
+                        "url": dummy_url
                     }
                 }
-            ]
+            })
         )
-        logging.info(f"Appended file block for '{file_path}' to page {page_id}")
+        logging.info("Queued file block for '%s' to page %s", file_path, page_id)
+    except NotionUnavailable:
+        raise
+    except APIResponseError as e:
+        logging.error("Notion API error appending file block for '%s' to page %s: %s", file_path, page_id, e)
+        raise
+    except Exception as e:
+        logging.error("Unexpected error appending file block for '%s' to page %s: %s", file_path, page_id, e)
+        raise
+
+async def append_link_block(page_id: str, target_page_id: str):
+    """
+    Appends a link_to_page block pointing at target_page_id to the Notion
+    page (queued on append_buffer).
+    """
+    if append_buffer.sent_count(page_id):
+        # Already appended by an earlier attempt
+        return
+    logging.debug("Appending link to page %s to page %s", target_page_id, page_id)
+    try:
+        await append_buffer.add(
+            page_id,
+            json.dumps({
+                "object": "block",
+                "type": "link_to_page",
+                "link_to_page": {
+                    "type": "page_id",
+                    "page_id": target_page_id
+                }
+            })
+        )
+        logging.info("Queued link to page %s for page %s", target_page_id, page_id)
+    except NotionUnavailable:
+        raise
     except APIResponseError as e:
-        logging.error(f"Notion API error appending file block for '{file_path}' to page {page_id}: {e}")
+        logging.error("Notion API error appending link block to page %s: %s", page_id, e)
         raise
     except Exception as e:
-        logging.error(f"Unexpected error appending file block for '{file_path}' to page {page_id}: {e}")
+        logging.error("Unexpected error appending link block to page %s: %s", page_id, e)
         raise
 
 # -------------------------------------------------
 # Main Logic
 # -------------------------------------------------
 
-def sync_folder_to_notion(folder_path: str, parent_page_id: str):
+def _open_text(file_path: str) -> TextIO:
+    """
+    Opens a UTF-8 text file for streaming. Runs on read_pool, off the event loop.
+    """
+    return open(file_path, "r", encoding="utf-8")
+
+def _read_docx(file_path: str) -> str:
+    """
+    Returns the text of a .docx file's paragraphs. Runs on read_pool.
+    """
+    doc = Document(file_path)
+    # Concatenate all paragraphs
+    return "\n".join([para.text for para in doc.paragraphs])
+
+def _read_rtf(file_path: str) -> str:
+    """
+    Returns the plain text of an .rtf file. Runs on read_pool.
+    """
+    with open(file_path, "r", encoding="utf-8") as rtf_file:
+        raw_rtf = rtf_file.read()
+    return rtf_to_text(raw_rtf)
+
+def _hash_file(file_path: str) -> str:
+    """
+    Returns a BLAKE2b digest of the file's contents. Runs on read_pool.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for data in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(data)
+    return digest.hexdigest()
+
+# Pages already created for files in this run, by cache key, so a file that
+# is retried after NotionUnavailable goes back to its own page.
+file_pages = {}
+
+async def _create_file_page(parent_page_id: str, filename: str, page_key: str, key: str) -> str:
+    """
+    Creates the page for a file, or returns the one an earlier, interrupted
+    attempt at the same file created in this run.
+
+    A page left by an earlier run (the file has changed since, or that run
+    was cut off before the file was fully synced) is moved to the trash,
+    so the file doesn't end up mirrored twice.
+    """
+    page_id = file_pages.get(key)
+    if page_id is None:
+        old_page_id = sync_cache.get("page", page_key)
+        if old_page_id:
+            logging.info("Replacing page %s for '%s'", old_page_id, filename)
+            try:
+                await trash_notion_page(old_page_id)
+            except NotionUnavailable:
+                raise
+            except Exception:
+                # e.g. it was already deleted in Notion
+                logging.warning("Could not move old page %s to trash; leaving it in place.", old_page_id)
+        page_id = await create_notion_page(parent_page_id, filename)
+        file_pages[key] = page_id
+        sync_cache.set("page", page_key, page_id)
+    return page_id
+
+async def _finish_file_page(key: str, page_id: str):
+    """
+    Sends whatever is still buffered for a file's page and records the file
+    as synced. Notion appends children one parent page at a time, so
+    flushing here costs no more requests than flushing at the end.
+    """
+    await append_buffer.flush(page_id)
+    sync_cache.set("block", key, page_id)
+
+async def _replace_with_placeholder(parent_page_id: str, filename: str, item_path: str, page_key: str, key: str, page_id: str) -> str:
+    """
+    Replaces the text queued for a file that turned out not to be readable
+    as UTF-8 text with a short "Could not parse" note. If part of the text was
+    already sent, the note goes on a fresh page and the old one is trashed.
+    Returns the ID of the page holding the note.
+    """
+    append_buffer.discard(page_id)
+    if append_buffer.sent_count(page_id):
+        file_pages.pop(key, None)
+        page_id = await _create_file_page(parent_page_id, filename, page_key, key)
+    await append_text_block(page_id, f"Could not parse file {os.path.basename(item_path)}")
+    return page_id
+
+# Text content synced in this run, keyed by content hash. Each value is a
+# future resolved with (page ID, file key) of the page holding that content
+# once the first copy is fully synced (or with None if that failed).
+content_pages = {}
+
+# The first text file seen in this run for each size, with its content_pages
+# future. It is only hashed (and entered in content_pages) once another text
+# file of the same size turns up; until then it can't have a duplicate.
+first_of_size = {}
+first_of_size_hashed = {}
+
+async def _register_content(item_path: str, claim: asyncio.Future):
+    """
+    Hashes a text file that was synced without being hashed and enters its
+    future in content_pages, so later copies of it can link to its page.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        digest = await loop.run_in_executor(read_pool, _hash_file, item_path)
+    except OSError as e:
+        logging.debug("Not checking '%s' for duplicates: %s", item_path, e)
+        return
+    content_pages.setdefault(digest, claim)
+
+async def _dedupe_digest(item_path: str, file_size: int, claim: asyncio.Future):
+    """
+    Returns the content hash to look up copies of item_path by, or None if
+    it isn't worth hashing: no other text file of the same size has turned
+    up in this run yet (item_path is remembered with claim in case one
+    does), or the file can't be read.
+    """
+    first = first_of_size.get(file_size)
+    if first is None:
+        first_of_size[file_size] = (item_path, claim)
+        return None
+    if file_size not in first_of_size_hashed:
+        first_of_size_hashed[file_size] = asyncio.ensure_future(_register_content(*first))
+    await first_of_size_hashed[file_size]
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(read_pool, _hash_file, item_path)
+    except OSError as e:
+        logging.debug("Not checking '%s' for duplicates: %s", item_path, e)
+        return None
+
+async def _sync_text_file(parent_page_id: str, filename: str, item_path: str, file_size: int, page_key: str, key: str):
+    """
+    Streams a text file into a new page. If a file with identical content
+    has already been synced in this run, the page links to that file's
+    page instead of holding a second copy of the text.
+    """
+    loop = asyncio.get_running_loop()
+    claim = loop.create_future()
+    synced_page = None
+    try:
+        digest = await _dedupe_digest(item_path, file_size, claim)
+        while digest is not None:
+            original = content_pages.get(digest)
+            if original is None or (original.done() and original.result() is None):
+                # Nobody has synced this content (successfully) yet; do it here
+                content_pages[digest] = claim
+                break
+            original_page = await original
+            if original_page:
+                original_page_id, original_page_key = original_page
+                logging.info("'%s' has the same content as page %s; linking to it", item_path, original_page_id)
+                file_page_id = await _create_file_page(parent_page_id, filename, page_key, key)
+                await append_link_block(file_page_id, original_page_id)
+                # So a later run can tell if the original's page was replaced
+                sync_cache.set("link", key, [original_page_key, original_page_id])
+                await _finish_file_page(key, file_page_id)
+                synced_page = original_page
+                return
+
+        file_page_id = await _create_file_page(parent_page_id, filename, page_key, key)
+        # Only open the file once its chunks are about to be sent, then stream
+        # it straight into the page instead of reading it whole
+        unreadable = False
+        async with open_file_slots:
+            try:
+                text_file = await loop.run_in_executor(read_pool, _open_text, item_path)
+                with text_file:
+                    await append_text_block(file_page_id, text_file)
+            except (OSError, UnicodeDecodeError) as e:
+                logging.warning("Could not read '%s' as UTF-8 text (%s); adding a placeholder instead.", item_path, e)
+                unreadable = True
+        if unreadable:
+            file_page_id = await _replace_with_placeholder(parent_page_id, filename, item_path, page_key, key, file_page_id)
+        await _finish_file_page(key, file_page_id)
+        synced_page = (file_page_id, page_key)
+    except NotionUnavailable:
+        raise
+    except Exception as e:
+        logging.warning("Failed to process text file '%s': %s", item_path, e)
+    finally:
+        # Let waiting duplicates link to this page, or sync their own copy
+        claim.set_result(synced_page)
+
+async def _sync_file_block_page(parent_page_id: str, filename: str, item_path: str, page_key: str, key: str):
+    """
+    Mirrors a file that isn't converted to text: a page holding a file block.
+    """
+    try:
+        file_page_id = await _create_file_page(parent_page_id, filename, page_key, key)
+        await append_file_block(file_page_id, item_path)
+        await _finish_file_page(key, file_page_id)
+    except NotionUnavailable:
+        raise
+    except Exception:
+        logging.warning("Failed to process file '%s'.", item_path)
+
+async def sync_item(entry: os.DirEntry, parent_page_id: str, enqueue):
     """
-    Recursively walk through the local file system and mirror the structure in Notion.
+    Mirrors a single directory entry into Notion under parent_page_id.
+    Subfolders get their own page and are queued with enqueue so any
+    worker can pick up their contents. NotionUnavailable is passed on to
+    the caller so the item can be queued again.
+    """
+    item = entry.name
+    item_path = entry.path
+    page_key = cache_key(parent_page_id, entry)
+    if entry.is_dir(follow_symlinks=False):
+        logging.info("Processing subfolder '%s'", item_path)
+        try:
+            folder_page_id = await create_notion_page(parent_page_id, item, page_key)
+        except NotionUnavailable:
+            raise
+        except Exception:
+            # If we fail to create the page, skip its contents
+            logging.warning("Skipping '%s' due to page creation failure.", item_path)
+            return
+        # Queue the folder's contents instead of recursing
+        enqueue("folder", item_path, folder_page_id)
+        return
+
+    try:
+        key = content_key(parent_page_id, entry)
+    except OSError as e:
+        # e.g. a broken symlink or a file removed mid-sync
+        logging.error("Error reading '%s': %s", item_path, e)
+        return
+    link = sync_cache.get("link", key)
+    if link and sync_cache.get("page", link[0]) != link[1]:
+        # This is a copy of a file whose page has been replaced since; sync
+        # it again rather than keep linking to the old page in the trash
+        logging.info("Original of '%s' has changed; syncing it again", item_path)
+        sync_cache.discard("link", key)
+        sync_cache.discard("block", key)
+    synced_page_id = sync_cache.get("block", key)
+    if synced_page_id and sync_cache.get("page", page_key) in (None, synced_page_id):
+        # (No "page" entry if the cache predates file pages being recorded)
+        sync_cache.set("page", page_key, synced_page_id)
+        logging.info("Skipping unchanged file '%s' (already synced)", item_path)
+        return
+
+    # Split off the extension with a single rpartition, lower-casing only the suffix
+    stem, dot, suffix = item.rpartition(".")
+    filename, ext_lower = (stem, "." + suffix.lower()) if dot else (item, "")
+    logging.info("Processing file '%s' (extension: '%s')", item_path, ext_lower)
+    if ext_lower in TEXT_EXTS:
+        file_size = entry.stat().st_size
+        if file_size == 0:
+            # Nothing to append, so don't send an empty append request
+            try:
+                file_page_id = await _create_file_page(parent_page_id, filename, page_key, key)
+                await _finish_file_page(key, file_page_id)
+            except NotionUnavailable:
+                raise
+            except Exception:
+                logging.warning("Failed to process text file '%s'.", item_path)
+            return
+        if file_size > MAX_TEXT_SIZE:
+            logging.warning("'%s' is larger than %s bytes; adding it as a file block instead.", item_path, MAX_TEXT_SIZE)
+            await _sync_file_block_page(parent_page_id, filename, item_path, page_key, key)
+            return
+
+        await _sync_text_file(parent_page_id, filename, item_path, file_size, page_key, key)
+        return
+
+    elif ext_lower == ".docx":
+        # Use python-docx to parse, off the event loop
+        try:
+            loop = asyncio.get_running_loop()
+            file_content = await loop.run_in_executor(read_pool, _read_docx, item_path)
+        except Exception as e:
+            logging.error("Error parsing DOCX file '%s': %s", item_path, e)
+            file_content = f"Could not parse docx file {item}"
+
+    elif ext_lower == ".rtf":
+        # Use striprtf to parse, off the event loop
+        try:
+            loop = asyncio.get_running_loop()
+            file_content = await loop.run_in_executor(read_pool, _read_rtf, item_path)
+        except Exception as e:
+            logging.error("Error parsing RTF file '%s': %s", item_path, e)
+            file_content = f"Could not parse rtf file {item}"
+
+    elif ext_lower == ".doc":
+        # Basic approach #1: Skip or stub out
+        file_content = (
+            "DOC files are not directly supported. "
+            "Please convert .doc to .docx or text before importing."
+        )
+
+    else:
+        await _sync_file_block_page(parent_page_id, filename, item_path, page_key, key)
+        return
+
+    try:
+        file_page_id = await _create_file_page(parent_page_id, filename, page_key, key)
+        await append_text_block(file_page_id, file_content)
+        await _finish_file_page(key, file_page_id)
+    except NotionUnavailable:
+        raise
+    except Exception:
+        logging.warning("Failed to process text file '%s'.", item_path)
+
+async def _sync_entry(entry: os.DirEntry, parent_page_id: str, enqueue, failures: int = 0):
+    """
+    Runs sync_item, queueing the entry again for later if Notion was
+    unavailable, unless it has been down for too long already or this
+    entry's own requests keep failing. failures counts how often the
+    latter has happened so far.
+    """
+    try:
+        await sync_item(entry, parent_page_id, enqueue)
+    except NotionUnavailable as e:
+        if not isinstance(e, BreakerOpen):
+            failures += 1
+        if notion_breaker.trips >= MAX_BREAKER_TRIPS or failures > MAX_ITEM_RETRIES:
+            logging.warning("Giving up on '%s'; Notion has been unavailable for too long.", entry.path)
+            return
+        logging.info("Notion unavailable; queueing '%s' to retry later", entry.path)
+        enqueue("item", entry, parent_page_id, failures)
+
+async def _sync_folder(folder_path: str, parent_page_id: str, enqueue):
+    """
+    Syncs every item of folder_path concurrently. Subfolders are not
+    descended into here; they are queued with enqueue.
+    """
+    # A single scandir pass gives us names, paths and file types without
+    # stat-ing each entry again.
+    with os.scandir(folder_path) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    logging.info("Syncing folder '%s' -> Notion page %s", folder_path, parent_page_id)
+
+    coros = []
+    for entry in entries:
+        # Skip hidden files or folders if desired
+        if entry.name.startswith('.'):
+            logging.debug("Skipping hidden item '%s'", entry.name)
+            continue
+        # Don't follow symlinked folders (they could loop back up the tree),
+        # and don't mirror them as files either
+        if entry.is_symlink() and entry.is_dir():
+            logging.warning("Skipping symlinked folder '%s'; symlinked folders are not mirrored.", entry.path)
+            continue
+        coros.append(_sync_entry(entry, parent_page_id, enqueue))
+
+    await asyncio.gather(*coros)
+
+async def sync_folder_to_notion(folder_path: str, parent_page_id: str):
+    """
+    Walk through the local file system and mirror the structure in Notion.
     - Folders become pages containing their children.
     - Text-like files become pages with text blocks.
     - Other files become pages with a file block (or you can embed them however you like).
+
+    Folders are processed from a shared work queue by FOLDER_WORKERS
+    coroutines rather than by recursion, so work from anywhere in the tree
+    can run concurrently and deep trees don't hit the recursion limit. The
+    number of requests in flight is bounded by api_semaphore and their
+    rate by rate_limiter. Items cut off by server errors, timeouts or the
+    circuit breaker are queued again and retried once it lets calls through.
+    Any blocks still buffered are flushed once the whole tree has been walked.
     """
     if not os.path.isdir(folder_path):
-        logging.error(f"'{folder_path}' is not a valid directory. Skipping.")
+        logging.error("'%s' is not a valid directory. Skipping.", folder_path)
         return
 
-    items = sorted(os.listdir(folder_path))
-    logging.info(f"Syncing folder '{folder_path}' -> Notion page {parent_page_id}")
-    
-    for item in items:
-        # Skip hidden files or folders if desired
-        if item.startswith('.'):
-            logging.debug(f"Skipping hidden item '{item}'")
-            continue
+    # Work items are ("folder", path, page_id, 0) to sync a folder's contents
+    # into its page, or ("item", entry, parent_page_id, failures) to retry a
+    # single entry that was cut off by NotionUnavailable.
+    work = deque([("folder", folder_path, parent_page_id, 0)])
+    work_added = asyncio.Event()
+    done = asyncio.Event()
+    busy = 0
 
-        item_path = os.path.join(folder_path, item)
-        if os.path.isdir(item_path):
-            logging.info(f"Processing subfolder '{item_path}'")
-            try:
-                folder_page_id = create_notion_page(parent_page_id, item)
-            except Exception:
-                # If we fail to create the page, skip recursion
-                logging.warning(f"Skipping '{item_path}' due to page creation failure.")
+    def enqueue(kind: str, target, page_id: str, failures: int = 0):
+        work.append((kind, target, page_id, failures))
+        work_added.set()
+
+    async def worker():
+        nonlocal busy
+        while not done.is_set():
+            if not work:
+                if busy == 0:
+                    # Nothing queued and nobody left to queue more
+                    done.set()
+                    break
+                work_added.clear()
+                await work_added.wait()
                 continue
-            # Recurse into the folder
-            sync_folder_to_notion(item_path, folder_page_id)
-        else:
-            filename, extension = os.path.splitext(item)
-            logging.info(f"Processing file '{item_path}' (extension: '{extension}')")
-            ext_lower = extension.lower()
-            if ext_lower in [".txt", ".md"]:
-                try:
-                    with open(item_path, "r", encoding="utf-8") as f:
-                        file_content = f.read()
-                except Exception as e:
-                    # If there's an error reading, skip or handle as needed
-                    logging.error(f"Error reading file '{item_path}': {e}")
-                    file_content = f"Could not parse file {item}"
-
-            elif ext_lower == ".docx":
-                # Use python-docx to parse
-                try:
-                    from docx import Document  # Move to top-level imports if you like
-                    doc = Document(item_path)
-                    # Concatenate all paragraphs
-                    file_content = "\n".join([para.text for para in doc.paragraphs])
-                except Exception as e:
-                    logging.error(f"Error parsing DOCX file '{item_path}': {e}")
-                    file_content = f"Could not parse docx file {item}"
-
-            elif ext_lower == ".rtf":
-                # Use striprtf to parse
-                try:
-                    from striprtf.striprtf import rtf_to_text  # Move to top-level imports if you like
-                    with open(item_path, "r", encoding="utf-8") as rtf_file:
-                        raw_rtf = rtf_file.read()
-                    file_content = rtf_to_text(raw_rtf)
-                except Exception as e:
-                    logging.error(f"Error parsing RTF file '{item_path}': {e}")
-                    file_content = f"Could not parse rtf file {item}"
-
-            elif ext_lower == ".doc":
-                # Basic approach #1: Skip or stub out
-                file_content = (
-                    "DOC files are not directly supported. "
-                    "Please convert .doc to .docx or text before importing."
-                )
 
-            else:
-                try:
-                    file_page_id = create_notion_page(parent_page_id, filename)
-                    append_file_block(file_page_id, item_path)
-                except Exception:
-                    logging.warning(f"Failed to process file '{item_path}'.")
-                    continue
-                
-        try:
-            file_page_id = create_notion_page(parent_page_id, filename)
-            append_text_block(file_page_id, file_content)
-        except Exception:
-            logging.warning(f"Failed to process text file '{item_path}'.")
-            continue
+            # Don't pull work only to have it bounce off the open breaker,
+            # unless items are being given up on anyway
+            pause = notion_breaker.retry_after()
+            if pause and notion_breaker.trips < MAX_BREAKER_TRIPS:
+                await asyncio.sleep(pause)
+                continue
+
+            kind, target, page_id, failures = work.popleft()
+            busy += 1
+            try:
+                if kind == "folder":
+                    await _sync_folder(target, page_id, enqueue)
+                else:
+                    await _sync_entry(target, page_id, enqueue, failures)
+            except Exception as e:
+                logging.error("Error syncing '%s': %s", target if kind == "folder" else target.path, e)
+            finally:
+                busy -= 1
+                # Wake idle workers so they can pick up new work or notice we're done
+                work_added.set()
+
+    await asyncio.gather(*(worker() for _ in range(FOLDER_WORKERS)))
+    await append_buffer.flush_all()
+
+async def _run_sync(folder_path: str, parent_page_id: str):
+    """
+    Runs the sync and closes the shared HTTP client afterwards.
+    """
+    try:
+        await sync_folder_to_notion(folder_path, parent_page_id)
+    finally:
+        await http_client.aclose()
 
 def main():
     parser = argparse.ArgumentParser(description="Mirror a local folder structure into a Notion page.")
     parser.add_argument("-p","--page", required=True, help="Notion destination page ID.")
     parser.add_argument("-f","--folder", required=True, help="Path to the local root folder to mirror.")
     parser.add_argument("-d","--debug", action="store_true", help="Enable addvanced debug logging.")
+    parser.add_argument("-c","--cache", default=".notion_sync_cache.json", help="Path of the sync cache used to skip items synced by earlier runs.")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the sync cache.")
 
     args = parser.parse_args()
     notion_destination_page_id = args.page
@@ -246,12 +1066,19 @@ def main():
 
     # Basic validation for folder path
     if not os.path.isdir(local_root_folder):
-        logging.error(f"Error: '{local_root_folder}' is not a valid directory.")
+        logging.error("Error: '%s' is not a valid directory.", local_root_folder)
         exit(1)
 
+    if not args.no_cache:
+        sync_cache.load(args.cache)
+
     # Mirror the folder into Notion
     logging.info("Starting Notion folder sync.")
-    sync_folder_to_notion(local_root_folder, notion_destination_page_id)
+    try:
+        asyncio.run(_run_sync(local_root_folder, notion_destination_page_id))
+    finally:
+        # Save even if interrupted, so the next run can resume
+        sync_cache.save()
     logging.info("Sync completed.")
 
 if __name__ == "__main__":